@@ -10,7 +10,7 @@ The first 3 cells of the notebook handle:
 This script handles:
   Step 4 — CSV → JSON conversion
   Step 5 — Parse & truncate publications/grants (max 10 each)
-  Step 6 — Gemma-3 AI enrichment via Google Gemini API (one entry at a time)
+  Step 6 — Gemma-3 AI enrichment via Google Gemini API (concurrent, rate-limited)
   Step 7 — Final schema assembly
   Step 8 — MongoDB upload + static fallback copy
 
@@ -20,14 +20,22 @@ Usage:
   python pipeline_continuation.py --step 6 --only  # Run only step 6
 """
 
+import argparse
+import asyncio
 import csv
-import json
+import gzip
 import os
 import sys
+import threading
 import time
-import shutil
-import argparse
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from datetime import date
+from email.utils import parsedate_to_datetime
+from operator import itemgetter
+
+import orjson
 
 # ═══════════════════════════════════════════════════════════════════
 # Configuration
@@ -36,10 +44,10 @@ from datetime import datetime
 # Input from notebook's Step 3
 INPUT_CSV = "ufl_scholars_data_complete.csv"
 
-# Intermediate outputs
-INTERMEDIATE_JSON = "scholars_raw.json"
-PARSED_JSON = "scholars_parsed.json"
-ENRICHED_JSON = "scholars_enriched.json"
+# Intermediate outputs (JSON Lines — one scholar per line, streamable)
+INTERMEDIATE_JSON = "scholars_raw.jsonl"
+PARSED_JSON = "scholars_parsed.jsonl"
+ENRICHED_JSON = "scholars_enriched.jsonl"
 FINAL_JSON = "scholars_final.json"
 
 # Truncation limits
@@ -48,16 +56,24 @@ MAX_GRANTS = 10
 
 # ── Google Gemini API Settings ──
 # Get your API key from https://aistudio.google.com/apikey
+# Supply several keys as a JSON list in GOOGLE_API_KEYS to multiply throughput;
+# GOOGLE_API_KEY alone still works as a single-key pool.
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY", "")
 GEMINI_MODEL = "gemma-3-27b-it"
 GEMINI_API_URL = (
     f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
 )
 
-BATCH_SIZE = 5          # Save checkpoint every N scholars
-REQUEST_DELAY = 4       # Seconds between API calls (Gemini free tier: 15 RPM)
+REQUEST_DELAY = 4       # Seconds between API calls in the serial fallback path
 MAX_RETRIES = 3         # Retries per scholar on API failure
-CHECKPOINT_FILE = "enrichment_checkpoint.json"
+CHECKPOINT_FILE = "enrichment_checkpoint.jsonl"  # Append-only log, one scholar/line
+LEGACY_CHECKPOINT_FILE = "enrichment_checkpoint.json"  # Dict format, pre-JSONL runs
+
+# Concurrent enrichment (async path): keep CONCURRENCY calls in flight while a
+# token bucket meters request starts to the tier's RPM quota.
+# Free tier: 15 RPM. Tier 1: 300 RPM — set GEMINI_RPM accordingly.
+CONCURRENCY = int(os.environ.get("GEMINI_CONCURRENCY", "4"))
+GEMINI_RPM = int(os.environ.get("GEMINI_RPM", "15"))
 
 # MongoDB
 MONGODB_DB = "ufl_scholars_db"
@@ -67,15 +83,113 @@ MONGODB_COLLECTION = "scholars"
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 
+# ═══════════════════════════════════════════════════════════════════
+# JSON Lines helpers
+# ═══════════════════════════════════════════════════════════════════
+
+def _write_jsonl(path, records):
+    """Write records to path as JSON Lines (one object per line)."""
+    with open(path, "wb") as f:
+        for rec in records:
+            f.write(orjson.dumps(rec))
+            f.write(b"\n")
+
+
+def _iter_jsonl(path):
+    """Stream records from a JSON Lines file, one at a time."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
 # ═══════════════════════════════════════════════════════════════════
 # Step 4: CSV → JSON Conversion
 # ═══════════════════════════════════════════════════════════════════
 
+JSON_COLS = ("publications_json", "grants_json")
+
+# Columns that steps 5–7 actually consume — everything else in the raw CSV is
+# dead weight through every intermediate file, so project it away up front
+KEEP_COLS = {
+    "discoveryUrlId",
+    "id",
+    "name",
+    "firstName",
+    "lastName",
+    "title",
+    "email",
+    "department",
+    "position",
+    "tags",
+    "publications_json",
+    "grants_json",
+}
+
+
+def _parse_json_cell(raw, json_col, scholar_id):
+    """Parse one raw JSON cell, warning (not failing) on malformed data."""
+    if not raw:
+        return {}
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        print(f"  Warning: Could not parse {json_col} for {scholar_id}")
+        return {}
+
+
+def _read_csv_pandas(pd):
+    """Parse INPUT_CSV with pandas' C engine, then bulk-parse the JSON columns."""
+    df = pd.read_csv(
+        INPUT_CSV,
+        dtype=str,
+        keep_default_na=False,
+        engine="c",
+        usecols=lambda c: c in KEEP_COLS,
+    )
+
+    ids = df["discoveryUrlId"] if "discoveryUrlId" in df.columns else None
+    for col in df.columns:
+        if col not in JSON_COLS:
+            df[col] = df[col].str.strip()
+    for col in JSON_COLS:
+        if col not in df.columns:
+            continue
+        df[col] = [
+            _parse_json_cell(raw, col, ids.iloc[i] if ids is not None else "?")
+            for i, raw in enumerate(df[col])
+        ]
+
+    # Convert to records only at the write boundary
+    return df.to_dict(orient="records")
+
+
+def _read_csv_stdlib():
+    """Parse INPUT_CSV with csv.DictReader (fallback when pandas is missing)."""
+    scholars = []
+    with open(INPUT_CSV, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            scholar = {
+                k: v.strip() if isinstance(v, str) else v
+                for k, v in row.items()
+                if k in KEEP_COLS
+            }
+            for json_col in JSON_COLS:
+                scholar[json_col] = _parse_json_cell(
+                    scholar.get(json_col, ""),
+                    json_col,
+                    scholar.get("discoveryUrlId", "?"),
+                )
+            scholars.append(scholar)
+    return scholars
+
+
 def step4_csv_to_json():
     """Convert the enriched CSV into a JSON file.
 
     Parses the publications_json and grants_json columns from raw JSON strings
-    back into Python objects.
+    back into Python objects. Uses pandas' C CSV parser when available (5–10×
+    faster than the pure-Python DictReader on a multi-MB CSV).
     """
     print("\n" + "=" * 60)
     print("Step 4: CSV → JSON Conversion")
@@ -85,29 +199,18 @@ def step4_csv_to_json():
         print(f"Error: '{INPUT_CSV}' not found in {os.getcwd()}")
         sys.exit(1)
 
-    scholars = []
-
-    with open(INPUT_CSV, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            scholar = dict(row)
-
-            # Parse JSON string columns back into dicts/lists
-            for json_col in ["publications_json", "grants_json"]:
-                raw = scholar.get(json_col, "{}")
-                try:
-                    scholar[json_col] = json.loads(raw) if raw else {}
-                except json.JSONDecodeError:
-                    print(
-                        f"  Warning: Could not parse {json_col} for "
-                        f"{scholar.get('discoveryUrlId', '?')}"
-                    )
-                    scholar[json_col] = {}
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
 
-            scholars.append(scholar)
+    if pd is not None:
+        scholars = _read_csv_pandas(pd)
+    else:
+        print("  ⚠ pandas not installed — falling back to csv.DictReader")
+        scholars = _read_csv_stdlib()
 
-    with open(INTERMEDIATE_JSON, "w", encoding="utf-8") as f:
-        json.dump(scholars, f, indent=2, ensure_ascii=False)
+    _write_jsonl(INTERMEDIATE_JSON, scholars)
 
     print(f"✓ Converted {len(scholars)} scholars from CSV → JSON")
     print(f"  Saved to: {INTERMEDIATE_JSON}")
@@ -149,12 +252,23 @@ def _parse_publications(pub_data, max_count=MAX_PUBLICATIONS):
         if isinstance(pub_date, dict):
             pub_date = str(pub_date.get("year", ""))
 
+        # Numeric sort key — lexicographic order breaks when ISO dates and
+        # bare years mix, and an int compare is far cheaper anyway
+        year = pub_date[:4]
         publications.append(
-            {"title": title, "abstract": abstract, "date": pub_date}
+            {
+                "title": title,
+                "abstract": abstract,
+                "date": pub_date,
+                "_sort": int(year) if year.isdigit() else 0,
+            }
         )
 
-    publications.sort(key=lambda x: x.get("date", ""), reverse=True)
-    return publications[:max_count]
+    publications.sort(key=itemgetter("_sort"), reverse=True)
+    publications = publications[:max_count]
+    for pub in publications:
+        del pub["_sort"]
+    return publications
 
 
 def _parse_grants(grant_data, max_count=MAX_GRANTS):
@@ -172,6 +286,7 @@ def _parse_grants(grant_data, max_count=MAX_GRANTS):
 
     active_grants = []
     expired_grants = []
+    today = date.today()
 
     for grant in resources:
         if not isinstance(grant, dict):
@@ -186,12 +301,12 @@ def _parse_grants(grant_data, max_count=MAX_GRANTS):
         end_date = grant.get("endDate", "") or ""
         duration = f"{start_date} to {end_date}" if start_date and end_date else ""
 
-        # Determine active vs expired
+        # Determine active vs expired — fromisoformat is ~10× faster than
+        # strptime, which re-interprets its format string on every call
         status = "Active"
         if end_date:
             try:
-                end_dt = datetime.strptime(end_date[:10], "%Y-%m-%d")
-                if end_dt < datetime.now():
+                if date.fromisoformat(end_date[:10]) < today:
                     status = "Expired"
             except ValueError:
                 pass
@@ -211,77 +326,74 @@ def _parse_grants(grant_data, max_count=MAX_GRANTS):
     return active_grants[:max_count], expired_grants[:max_count]
 
 
+def _transform_scholar(scholar):
+    """Parse and truncate one scholar's publications/grants.
+
+    Top-level (picklable) so step 5 can fan it out across worker processes.
+    """
+    scholar["publications"] = _parse_publications(
+        scholar.get("publications_json", {})
+    )
+    active, expired = _parse_grants(scholar.get("grants_json", {}))
+    scholar["active_grants"] = active
+    scholar["expired_grants"] = expired
+    scholar["active_grants_count"] = len(active)
+
+    # Remove raw JSON columns
+    scholar.pop("publications_json", None)
+    scholar.pop("grants_json", None)
+    return scholar
+
+
 def step5_parse_and_truncate():
-    """Parse and truncate publications/grants for all scholars."""
+    """Parse and truncate publications/grants for all scholars.
+
+    The per-scholar transform is CPU-bound and independent, so it fans out
+    across cores with ProcessPoolExecutor; a generous chunksize keeps IPC
+    pickling overhead amortized. Results stream straight to the JSONL output.
+    """
     print("\n" + "=" * 60)
     print("Step 5: Parse & Truncate Publications/Grants")
     print("=" * 60)
 
-    with open(INTERMEDIATE_JSON, "r", encoding="utf-8") as f:
-        scholars = json.load(f)
+    count = 0
+    total_pubs = 0
+    total_active = 0
+    total_expired = 0
 
-    for i, scholar in enumerate(scholars):
-        scholar["publications"] = _parse_publications(
-            scholar.get("publications_json", {})
-        )
-        active, expired = _parse_grants(scholar.get("grants_json", {}))
-        scholar["active_grants"] = active
-        scholar["expired_grants"] = expired
-        scholar["active_grants_count"] = len(active)
-
-        # Remove raw JSON columns
-        scholar.pop("publications_json", None)
-        scholar.pop("grants_json", None)
+    with ProcessPoolExecutor() as ex, open(PARSED_JSON, "wb") as out:
+        for scholar in ex.map(
+            _transform_scholar, _iter_jsonl(INTERMEDIATE_JSON), chunksize=256
+        ):
+            out.write(orjson.dumps(scholar))
+            out.write(b"\n")
 
-        if (i + 1) % 500 == 0:
-            print(f"  Processed {i + 1}/{len(scholars)} scholars...")
+            count += 1
+            total_pubs += len(scholar["publications"])
+            total_active += len(scholar["active_grants"])
+            total_expired += len(scholar["expired_grants"])
 
-    with open(PARSED_JSON, "w", encoding="utf-8") as f:
-        json.dump(scholars, f, indent=2, ensure_ascii=False)
+            if count % 500 == 0:
+                print(f"  Processed {count} scholars...")
 
-    total_pubs = sum(len(s.get("publications", [])) for s in scholars)
-    total_active = sum(len(s.get("active_grants", [])) for s in scholars)
-    total_expired = sum(len(s.get("expired_grants", [])) for s in scholars)
-
-    print(f"✓ Parsed & truncated {len(scholars)} scholars")
+    print(f"✓ Parsed & truncated {count} scholars")
     print(f"  Max {MAX_PUBLICATIONS} publications, {MAX_GRANTS} grants each")
     print(f"  Totals: {total_pubs} pubs, {total_active} active grants, {total_expired} expired grants")
     print(f"  Saved to: {PARSED_JSON}")
-    return scholars
 
 
 # ═══════════════════════════════════════════════════════════════════
 # Step 6: Gemma-3 AI Enrichment via Google Gemini API
 # ═══════════════════════════════════════════════════════════════════
 
-def _build_prompt(scholar):
-    """Build the prompt for Gemma-3 to analyze a scholar's CS relevance."""
-
-    # Summarize publications (title + first 200 chars of abstract)
-    pub_lines = []
-    for p in scholar.get("publications", []):
-        line = f"- {p['title']}"
-        if p.get("abstract"):
-            line += f" | Abstract: {p['abstract'][:200]}..."
-        pub_lines.append(line)
-    pub_text = "\n".join(pub_lines) if pub_lines else "None"
-
-    # Summarize grants
-    grant_lines = []
-    for g in scholar.get("active_grants", []) + scholar.get("expired_grants", []):
-        line = f"- {g['title']} (Funder: {g.get('funder_name', 'N/A')}, Status: {g.get('status', 'N/A')})"
-        grant_lines.append(line)
-    grant_text = "\n".join(grant_lines) if grant_lines else "None"
-
-    tags = scholar.get("tags", [])
-    tags_text = ", ".join(tags) if tags else "None"
-
-    return f"""You are an expert academic advisor analyzing a university professor's research profile to determine their relevance to Computer Science (CS) collaboration.
+# Prompt skeleton shared by every call — interpolated via format_map so the
+# literal is parsed once at import instead of rebuilt per scholar
+_PROMPT_TEMPLATE = """You are an expert academic advisor analyzing a university professor's research profile to determine their relevance to Computer Science (CS) collaboration.
 
 Professor Profile:
-- Name: {scholar.get("name", "Unknown")}
-- Department: {scholar.get("department", "Unknown")}
-- Position: {scholar.get("position", "Unknown")}
+- Name: {name}
+- Department: {department}
+- Position: {position}
 - Research Tags: {tags_text}
 
 Recent Publications (up to 10):
@@ -310,27 +422,63 @@ Based on this profile, provide a JSON response with EXACTLY these fields:
 Respond with ONLY valid JSON, no markdown fences, no explanation."""
 
 
-def _call_gemini(prompt, retries=MAX_RETRIES):
-    """Call Gemma-3-27B-IT via Google Gemini API (one entry at a time).
+def _build_prompt(scholar):
+    """Build the prompt for Gemma-3 to analyze a scholar's CS relevance."""
 
-    Uses the REST API:
-    POST https://generativelanguage.googleapis.com/v1beta/models/gemma-3-27b-it:generateContent?key=API_KEY
-    """
-    import requests
+    get = scholar.get
 
-    if not GOOGLE_API_KEY:
-        print("  ⚠ GOOGLE_API_KEY not set! Set via: export GOOGLE_API_KEY='your-key'")
-        return {
-            "relevance_score": 0,
-            "reasoning": ["GOOGLE_API_KEY not configured."],
-            "requirements": [],
-            "should_email": "No",
-            "tags": [],
-        }
+    # Summarize publications (title + first 200 chars of abstract)
+    pub_text = "\n".join(
+        f"- {p['title']} | Abstract: {p['abstract'][:200]}..."
+        if p.get("abstract")
+        else f"- {p['title']}"
+        for p in get("publications", [])
+    ) or "None"
 
-    url = f"{GEMINI_API_URL}?key={GOOGLE_API_KEY}"
+    # Summarize grants
+    grant_text = "\n".join(
+        f"- {g['title']} (Funder: {g.get('funder_name', 'N/A')}, "
+        f"Status: {g.get('status', 'N/A')})"
+        for g in chain(get("active_grants", []), get("expired_grants", []))
+    ) or "None"
+
+    tags_text = ", ".join(get("tags", [])) or "None"
+
+    return _PROMPT_TEMPLATE.format_map({
+        "name": get("name", "Unknown"),
+        "department": get("department", "Unknown"),
+        "position": get("position", "Unknown"),
+        "tags_text": tags_text,
+        "pub_text": pub_text,
+        "grant_text": grant_text,
+    })
+
+
+# Structured-output schema for generateContent (Gemini's OpenAPI subset,
+# uppercase types) — mirrors AI_SCHEMA so the model is constrained to emit
+# exactly the shape the validator expects, with no markdown fences to strip.
+GEMINI_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "relevance_score": {"type": "INTEGER"},
+        "reasoning": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "requirements": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "should_email": {"type": "STRING", "enum": ["Yes", "No"]},
+        "tags": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": [
+        "relevance_score",
+        "reasoning",
+        "requirements",
+        "should_email",
+        "tags",
+    ],
+}
 
-    payload = {
+
+def _build_payload(prompt):
+    """Build the generateContent request body (shared by sync and async callers)."""
+    return {
         "contents": [
             {
                 "parts": [
@@ -342,47 +490,218 @@ def _call_gemini(prompt, retries=MAX_RETRIES):
             "temperature": 0.3,
             "maxOutputTokens": 800,
             "responseMimeType": "application/json",
+            "responseSchema": GEMINI_RESPONSE_SCHEMA,
         },
     }
 
+
+def _parse_gemini_response(data):
+    """Extract the generated text from a generateContent response and parse it."""
+    content = data["candidates"][0]["content"]["parts"][0]["text"]
+    return orjson.loads(content)
+
+
+def _default_ai_result(reason):
+    """Schema-shaped zero result used when enrichment cannot run."""
+    return {
+        "relevance_score": 0,
+        "reasoning": [reason],
+        "requirements": [],
+        "should_email": "No",
+        "tags": [],
+    }
+
+
+def _retry_after_seconds(retry_after, fallback):
+    """Parse a Retry-After header value into seconds.
+
+    RFC 9110 allows both delay-seconds and an HTTP-date; anything
+    unparseable falls back to the caller's computed backoff.
+    """
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+        try:
+            dt = parsedate_to_datetime(retry_after)
+            return max(0.0, dt.timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return fallback
+
+
+def _load_api_keys():
+    """Resolve the API key list from the environment.
+
+    GOOGLE_API_KEYS (a JSON list) takes precedence; otherwise the single
+    GOOGLE_API_KEY is used as a one-key pool.
+    """
+    raw = os.environ.get("GOOGLE_API_KEYS", "")
+    if raw:
+        try:
+            keys = orjson.loads(raw)
+            if isinstance(keys, list) and keys and all(keys):
+                return [str(k) for k in keys]
+        except orjson.JSONDecodeError:
+            pass
+        print("  ⚠ GOOGLE_API_KEYS is not a valid JSON list of keys — ignoring it")
+    return [GOOGLE_API_KEY] if GOOGLE_API_KEY else []
+
+
+class KeyPool:
+    """LRU-rotating pool of Gemini API keys with per-key 429 cooldowns.
+
+    reserve_key() hands out the least-recently-used key that is not cooling
+    down; a key that hits 429 RESOURCE_EXHAUSTED is put on cooldown so the
+    next call fails over to another key instead of stalling the whole job.
+    Cooldowns are kept in memory only — they last seconds, so a restarted
+    run just rediscovers them on the first 429.
+    """
+
+    def __init__(self, keys):
+        if not keys:
+            raise ValueError("KeyPool needs at least one API key")
+        self._lock = threading.Lock()
+        self._keys = deque((key, 0.0) for key in keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def try_reserve(self):
+        """Return (key, 0.0) if one is available now, else (None, seconds_to_wait)."""
+        now = time.time()
+        with self._lock:
+            for _ in range(len(self._keys)):
+                key, ready_at = self._keys.popleft()
+                self._keys.append((key, ready_at))
+                if ready_at <= now:
+                    return key, 0.0
+            soonest = min(ready_at for _, ready_at in self._keys)
+        return None, max(0.0, soonest - now)
+
+    def reserve_key(self):
+        """Block until a key is available and return it (sync path)."""
+        while True:
+            key, wait = self.try_reserve()
+            if key is not None:
+                return key
+            print(f"    All API keys cooling down. Waiting {wait:.0f}s...")
+            time.sleep(wait)
+
+    async def reserve_key_async(self):
+        """Await until a key is available and return it (async path)."""
+        while True:
+            key, wait = self.try_reserve()
+            if key is not None:
+                return key
+            print(f"    All API keys cooling down. Waiting {wait:.0f}s...")
+            await asyncio.sleep(wait)
+
+    def cooldown(self, key, seconds):
+        """Bench a key after a 429."""
+        with self._lock:
+            for i, (k, _) in enumerate(self._keys):
+                if k == key:
+                    self._keys[i] = (k, time.time() + seconds)
+                    break
+
+
+class _TokenBucket:
+    """Monotonic-clock token bucket metering request starts to an RPM budget.
+
+    Refills at rpm/60 tokens per second up to a small burst capacity; tasks
+    await acquire() before each request, so many calls overlap in flight while
+    the aggregate start rate stays under the quota.
+    """
+
+    def __init__(self, rpm, burst=None):
+        self.rate = rpm / 60.0
+        self.capacity = burst if burst is not None else max(1, rpm // 10)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+_SESSION = None
+
+
+def _get_session():
+    """Lazily create the shared requests.Session for the sync fallback path.
+
+    One pooled session keeps the TLS connection to the Gemini endpoint
+    alive, amortizing the handshake (~100–300ms) across calls.
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _SESSION = requests.Session()
+        _SESSION.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0),
+        )
+    return _SESSION
+
+
+def _call_gemini(prompt, pool, retries=MAX_RETRIES):
+    """Call Gemma-3-27B-IT via Google Gemini API (one entry at a time).
+
+    Serial fallback used when httpx is not installed. Uses the REST API:
+    POST https://generativelanguage.googleapis.com/v1beta/models/gemma-3-27b-it:generateContent?key=API_KEY
+    """
+    import requests
+
+    session = _get_session()
+    payload = _build_payload(prompt)
     headers = {"Content-Type": "application/json"}
 
     for attempt in range(retries):
+        key = pool.reserve_key()
         try:
-            response = requests.post(
-                url,
+            response = session.post(
+                f"{GEMINI_API_URL}?key={key}",
                 json=payload,
                 headers=headers,
                 timeout=120,
             )
 
-            # Handle rate limiting (429)
+            # Handle rate limiting (429) — bench this key, fail over to the next
             if response.status_code == 429:
-                wait_time = REQUEST_DELAY * (attempt + 2)
-                print(f"    Rate limited. Waiting {wait_time}s...")
-                time.sleep(wait_time)
+                wait_time = _retry_after_seconds(
+                    response.headers.get("Retry-After"),
+                    REQUEST_DELAY * (attempt + 2),
+                )
+                print(f"    Rate limited. Key benched for {wait_time:.0f}s...")
+                pool.cooldown(key, wait_time)
                 continue
 
             response.raise_for_status()
-            data = response.json()
-
-            # Extract text from Gemini API response
-            content = data["candidates"][0]["content"]["parts"][0]["text"]
-
-            # Strip markdown fences if present (safety net)
-            content = content.strip()
-            if content.startswith("```"):
-                content = content.split("\n", 1)[1]
-                content = content.rsplit("```", 1)[0]
-            content = content.strip()
-
-            return json.loads(content)
+            return _parse_gemini_response(response.json())
 
         except requests.exceptions.HTTPError as e:
             print(f"    Attempt {attempt + 1}/{retries} HTTP error: {e}")
             if attempt < retries - 1:
                 time.sleep(REQUEST_DELAY * (attempt + 1))
-        except (json.JSONDecodeError, KeyError, IndexError) as e:
+        # ValueError is the common ancestor of the stdlib, orjson, requests,
+        # and httpx JSON decode errors — response.json() raises the stdlib
+        # one, which is NOT a parent of orjson's
+        except (ValueError, KeyError, IndexError) as e:
             print(f"    Attempt {attempt + 1}/{retries} parse error: {e}")
             if attempt < retries - 1:
                 time.sleep(REQUEST_DELAY)
@@ -391,18 +710,121 @@ def _call_gemini(prompt, retries=MAX_RETRIES):
             if attempt < retries - 1:
                 time.sleep(REQUEST_DELAY * (attempt + 1))
 
-    # Defaults on failure
-    return {
-        "relevance_score": 0,
-        "reasoning": ["AI enrichment failed after all retries."],
-        "requirements": [],
-        "should_email": "No",
-        "tags": [],
-    }
+    return _default_ai_result("AI enrichment failed after all retries.")
+
+
+async def _call_gemini_async(client, prompt, sem, limiter, pool, retries=MAX_RETRIES):
+    """Call Gemma-3-27B-IT via Google Gemini API from an asyncio task.
+
+    The semaphore bounds in-flight requests; the token bucket keeps the
+    aggregate request rate under the tier's RPM quota. On 429 the key is
+    benched for the server's Retry-After and the retry fails over to the
+    pool's next available key.
+    """
+    import httpx
+
+    payload = _build_payload(prompt)
+
+    for attempt in range(retries):
+        try:
+            async with sem:
+                await limiter.acquire()
+                key = await pool.reserve_key_async()
+                response = await client.post(
+                    GEMINI_API_URL,
+                    params={"key": key},
+                    json=payload,
+                )
+
+            # Handle rate limiting (429) — bench this key, fail over to the next
+            if response.status_code == 429:
+                wait_time = _retry_after_seconds(
+                    response.headers.get("Retry-After"),
+                    REQUEST_DELAY * (attempt + 2),
+                )
+                print(f"    Rate limited. Key benched for {wait_time:.0f}s...")
+                pool.cooldown(key, wait_time)
+                continue
+
+            response.raise_for_status()
+            return _parse_gemini_response(response.json())
+
+        except httpx.HTTPStatusError as e:
+            print(f"    Attempt {attempt + 1}/{retries} HTTP error: {e}")
+            if attempt < retries - 1:
+                await asyncio.sleep(REQUEST_DELAY * (attempt + 1))
+        # ValueError is the common ancestor of the stdlib, orjson, requests,
+        # and httpx JSON decode errors — response.json() raises the stdlib
+        # one, which is NOT a parent of orjson's
+        except (ValueError, KeyError, IndexError) as e:
+            print(f"    Attempt {attempt + 1}/{retries} parse error: {e}")
+            if attempt < retries - 1:
+                await asyncio.sleep(REQUEST_DELAY)
+        except httpx.HTTPError as e:
+            print(f"    Attempt {attempt + 1}/{retries} network error: {e}")
+            if attempt < retries - 1:
+                await asyncio.sleep(REQUEST_DELAY * (attempt + 1))
+
+    return _default_ai_result("AI enrichment failed after all retries.")
+
+
+# Declarative schema for the AI response — compiled once per process by
+# fastjsonschema, so per-record validation is a single compiled-function call.
+AI_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "relevance_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "reasoning": {"type": "array", "items": {"type": "string"}, "maxItems": 10},
+        "requirements": {"type": "array", "items": {"type": "string"}, "maxItems": 10},
+        "should_email": {"type": "string", "enum": ["Yes", "No"]},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": [
+        "relevance_score",
+        "reasoning",
+        "requirements",
+        "should_email",
+        "tags",
+    ],
+}
+
+_AI_VALIDATOR = None  # (validator, error_class) once compiled; False if unavailable
+
+
+def _get_ai_validator():
+    """Compile AI_SCHEMA once per process; None when fastjsonschema is missing."""
+    global _AI_VALIDATOR
+    if _AI_VALIDATOR is None:
+        try:
+            import fastjsonschema
+            _AI_VALIDATOR = (
+                fastjsonschema.compile(AI_SCHEMA),
+                fastjsonschema.JsonSchemaException,
+            )
+        except ImportError:
+            _AI_VALIDATOR = False
+    return _AI_VALIDATOR or None
 
 
 def _validate_ai_response(result):
-    """Validate and sanitize the AI response to match the expected schema."""
+    """Validate the AI response against AI_SCHEMA.
+
+    A conforming response passes through the compiled validator untouched;
+    anything off-schema (or any response when fastjsonschema is not
+    installed) goes through the slower coercion path.
+    """
+    compiled = _get_ai_validator()
+    if compiled is not None:
+        validator, schema_error = compiled
+        try:
+            return validator(result)
+        except schema_error:
+            pass
+    return _coerce_ai_response(result)
+
+
+def _coerce_ai_response(result):
+    """Coerce a loosely-shaped AI response into the expected schema."""
     v = {}
 
     score = result.get("relevance_score", 0)
@@ -434,91 +856,205 @@ def _validate_ai_response(result):
     return v
 
 
+def _load_checkpoint():
+    """Replay the append-only checkpoint log into an id → ai_data dict.
+
+    A dict-format checkpoint from a pre-JSONL run is loaded first so its
+    completed (rate-limited, possibly paid) API work is not redone; log
+    entries overlay it. The end-of-run compaction then migrates everything
+    into the log format.
+    """
+    checkpoint = {}
+    if os.path.exists(LEGACY_CHECKPOINT_FILE):
+        try:
+            with open(LEGACY_CHECKPOINT_FILE, "rb") as f:
+                legacy = orjson.loads(f.read())
+            if isinstance(legacy, dict):
+                print(f"  Migrating legacy checkpoint: {LEGACY_CHECKPOINT_FILE}")
+                checkpoint.update(legacy)
+        except orjson.JSONDecodeError:
+            pass
+    if os.path.exists(CHECKPOINT_FILE):
+        with open(CHECKPOINT_FILE, "rb") as f:
+            for line in f:
+                try:
+                    rec = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # torn final line from an interrupted run
+                checkpoint[rec.pop("id")] = rec
+    return checkpoint
+
+
+def _append_checkpoint(log, scholar_id, ai_data):
+    """Append one completed scholar to the checkpoint log — O(1) per record."""
+    log.write(orjson.dumps({"id": scholar_id, **ai_data}))
+    log.write(b"\n")
+    log.flush()
+
+
+def _compact_checkpoint(checkpoint):
+    """Rewrite the log as one line per scholar, dropping superseded entries.
+
+    Writes to a sibling temp file and atomically replaces the log, so a
+    crash mid-compaction can never destroy the existing checkpoint.
+    """
+    tmp = CHECKPOINT_FILE + ".tmp"
+    _write_jsonl(
+        tmp,
+        ({"id": sid, **data} for sid, data in checkpoint.items()),
+    )
+    os.replace(tmp, CHECKPOINT_FILE)
+
+
+async def _enrich_async(pending, checkpoint, pool, log):
+    """Fan out Gemini calls for all pending scholars concurrently.
+
+    pending: list of (scholar_id, scholar) tuples not yet in the checkpoint.
+    Each result is appended to the checkpoint log as it completes.
+    """
+    import httpx
+
+    sem = asyncio.Semaphore(CONCURRENCY)
+    limiter = _TokenBucket(GEMINI_RPM * len(pool))
+
+    async with httpx.AsyncClient(timeout=120) as client:
+
+        async def _task(scholar_id, scholar):
+            raw = await _call_gemini_async(
+                client, _build_prompt(scholar), sem, limiter, pool
+            )
+            return scholar_id, scholar, _validate_ai_response(raw)
+
+        tasks = [asyncio.create_task(_task(sid, s)) for sid, s in pending]
+        completed = 0
+
+        for fut in asyncio.as_completed(tasks):
+            scholar_id, scholar, ai_data = await fut
+            checkpoint[scholar_id] = ai_data
+            _append_checkpoint(log, scholar_id, ai_data)
+            completed += 1
+
+            score = ai_data.get("relevance_score", 0)
+            email = ai_data.get("should_email", "No")
+            name = scholar.get("name", scholar_id)
+            print(f"[{completed}/{len(tasks)}] {name}: score={score}, email={email}")
+
+
 def step6_gemma_enrichment():
-    """Run Gemma-3 AI enrichment via Google Gemini API — one scholar at a time.
+    """Run Gemma-3 AI enrichment via Google Gemini API.
 
     Features:
-    - Checkpoint/resume: saves progress every BATCH_SIZE scholars
-    - Rate limiting: waits REQUEST_DELAY seconds between API calls
+    - Concurrent fan-out: asyncio + httpx keeps CONCURRENCY calls in flight,
+      rate-limited to GEMINI_RPM by a token bucket
+    - Checkpoint/resume: appends each completed scholar to a JSONL log
     - Retry logic: retries MAX_RETRIES times on failure with backoff
+    - Serial fallback: one call per REQUEST_DELAY seconds if httpx is missing
     """
     print("\n" + "=" * 60)
     print("Step 6: Gemma-3 AI Enrichment (Google Gemini API)")
     print("=" * 60)
 
-    if not GOOGLE_API_KEY:
-        print("ERROR: GOOGLE_API_KEY environment variable is not set.")
+    api_keys = _load_api_keys()
+    if not api_keys:
+        print("ERROR: no Gemini API key is configured.")
         print("  Get your key from: https://aistudio.google.com/apikey")
         print("  Then run: export GOOGLE_API_KEY='your-key-here'")
+        print("  (or export GOOGLE_API_KEYS='[\"key1\", \"key2\"]' for a pool)")
         sys.exit(1)
+    pool = KeyPool(api_keys)
 
     print(f"  Model: {GEMINI_MODEL}")
     print(f"  Endpoint: {GEMINI_API_URL}")
-    print(f"  Rate limit delay: {REQUEST_DELAY}s between calls")
+    print(f"  API keys: {len(pool)}")
 
-    with open(PARSED_JSON, "r", encoding="utf-8") as f:
-        scholars = json.load(f)
-
-    # Load checkpoint
-    checkpoint = {}
-    if os.path.exists(CHECKPOINT_FILE):
-        with open(CHECKPOINT_FILE, "r") as f:
-            checkpoint = json.load(f)
-    print(f"  Checkpoint: {len(checkpoint)} already-enriched scholars\n")
+    scholars = list(_iter_jsonl(PARSED_JSON))
 
-    enriched = []
-    skipped = 0
-    processed = 0
+    # Replay checkpoint log
+    checkpoint = _load_checkpoint()
 
+    # Everything not already enriched gets dispatched — except empty profiles,
+    # which the model would uniformly score 0; those resolve locally for free
+    pending = []
+    empty = 0
     for i, scholar in enumerate(scholars):
         scholar_id = scholar.get("discoveryUrlId", scholar.get("id", f"unknown_{i}"))
-
-        # Resume from checkpoint
         if scholar_id in checkpoint:
-            scholar.update(checkpoint[scholar_id])
-            enriched.append(scholar)
-            skipped += 1
             continue
+        if not (
+            scholar.get("publications")
+            or scholar.get("active_grants")
+            or scholar.get("expired_grants")
+            or scholar.get("tags")
+        ):
+            checkpoint[scholar_id] = _default_ai_result(
+                "Empty profile — no publications, grants, or tags."
+            )
+            empty += 1
+            continue
+        pending.append((scholar_id, scholar))
+    resumed = len(scholars) - len(pending) - empty
+    processed = len(pending)
+    print(
+        f"  Checkpoint: {resumed} already enriched, "
+        f"{empty} empty profiles skipped, {len(pending)} pending\n"
+    )
 
-        prompt = _build_prompt(scholar)
-        name = scholar.get("name", scholar_id)
-        print(f"[{i + 1}/{len(scholars)}] {name}...", end=" ", flush=True)
-
-        raw_result = _call_gemini(prompt)
-        ai_data = _validate_ai_response(raw_result)
-
-        scholar.update(ai_data)
-        enriched.append(scholar)
-
-        checkpoint[scholar_id] = ai_data
-        processed += 1
-
-        score = ai_data.get("relevance_score", 0)
-        email = ai_data.get("should_email", "No")
-        print(f"score={score}, email={email}")
+    if pending:
+        try:
+            import httpx  # noqa: F401
+            have_httpx = True
+        except ImportError:
+            have_httpx = False
+
+        with open(CHECKPOINT_FILE, "ab") as log:
+            if have_httpx:
+                print(f"  Concurrency: {CONCURRENCY} in-flight, {GEMINI_RPM} RPM budget")
+                asyncio.run(_enrich_async(pending, checkpoint, pool, log))
+            else:
+                print(
+                    "  ⚠ httpx not installed — serial fallback, "
+                    f"{REQUEST_DELAY}s between calls"
+                )
+                for n, (scholar_id, scholar) in enumerate(pending):
+                    name = scholar.get("name", scholar_id)
+                    print(f"[{n + 1}/{len(pending)}] {name}...", end=" ", flush=True)
+
+                    ai_data = _validate_ai_response(
+                        _call_gemini(_build_prompt(scholar), pool)
+                    )
+                    checkpoint[scholar_id] = ai_data
+                    _append_checkpoint(log, scholar_id, ai_data)
 
-        # Batch checkpoint save
-        if processed % BATCH_SIZE == 0:
-            with open(CHECKPOINT_FILE, "w") as f:
-                json.dump(checkpoint, f, indent=2, ensure_ascii=False)
-            print(f"  💾 Checkpoint saved ({processed} new, {skipped} resumed)")
+                    score = ai_data.get("relevance_score", 0)
+                    email = ai_data.get("should_email", "No")
+                    print(f"score={score}, email={email}")
 
-        # Rate limiting — respect Gemini API quotas
-        time.sleep(REQUEST_DELAY)
+                    # Rate limiting — respect Gemini API quotas
+                    time.sleep(REQUEST_DELAY)
 
-    # Final checkpoint save
-    with open(CHECKPOINT_FILE, "w") as f:
-        json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+    # Compact the log so it stays at one line per scholar across runs
+    _compact_checkpoint(checkpoint)
 
-    with open(ENRICHED_JSON, "w", encoding="utf-8") as f:
-        json.dump(enriched, f, indent=2, ensure_ascii=False)
+    # Merge checkpoint results back in input order, streaming to JSONL
+    scores = []
+    with open(ENRICHED_JSON, "wb") as f:
+        for i, scholar in enumerate(scholars):
+            scholar_id = scholar.get(
+                "discoveryUrlId", scholar.get("id", f"unknown_{i}")
+            )
+            scholar.update(checkpoint.get(scholar_id, {}))
+            scores.append(scholar.get("relevance_score", 0))
+            f.write(orjson.dumps(scholar))
+            f.write(b"\n")
 
     print(f"\n✓ Enrichment complete!")
-    print(f"  Total: {len(enriched)} | New: {processed} | Resumed: {skipped}")
+    print(
+        f"  Total: {len(scholars)} | New: {processed} | "
+        f"Empty: {empty} | Resumed: {resumed}"
+    )
     print(f"  Saved to: {ENRICHED_JSON}")
 
     # Score distribution
-    scores = [s.get("relevance_score", 0) for s in enriched]
     if scores:
         print(f"\nScore distribution:")
         for lo, hi, label in [
@@ -532,20 +1068,58 @@ def step6_gemma_enrichment():
             bar = "█" * count
             print(f"  {lo:>3}-{hi:<3} {label:<15} {count:>4} {bar}")
 
-    return enriched
-
 
 # ═══════════════════════════════════════════════════════════════════
 # Step 7: Final Schema Assembly
 # ═══════════════════════════════════════════════════════════════════
 
 def _build_name(scholar):
-    """Build display name from available name fields."""
-    if scholar.get("name"):
-        return scholar["name"]
-    first = scholar.get("firstName", "") or ""
-    last = scholar.get("lastName", "") or ""
-    return f"{first} {last}".strip() or scholar.get("discoveryUrlId", "Unknown")
+    """Build display name from available name fields.
+
+    Ordered so the overwhelmingly common case — a truthy "name" — returns
+    after a single dict lookup, with no intermediate strings built.
+    """
+    name = scholar.get("name")
+    if name:
+        return name
+    first = scholar.get("firstName")
+    last = scholar.get("lastName")
+    if first or last:
+        return f"{first or ''} {last or ''}".strip()
+    return scholar.get("discoveryUrlId", "Unknown")
+
+
+def _iter_enriched(path):
+    """Stream scholars from the enriched file regardless of its format.
+
+    Current runs write JSONL, which streams line by line; when the JSONL
+    file is absent, an older run's .json array file is picked up instead
+    and streamed through ijson so it is never loaded whole either. Only if
+    ijson is missing does the legacy case fall back to a full-file parse.
+    """
+    if not os.path.exists(path):
+        legacy = os.path.splitext(path)[0] + ".json"
+        if os.path.exists(legacy):
+            print(f"  Using legacy enriched file: {legacy}")
+            path = legacy
+
+    with open(path, "rb") as f:
+        head = f.read(1)
+    if head != b"[":
+        yield from _iter_jsonl(path)
+        return
+
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    with open(path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "item")
+        else:
+            print("  ⚠ ijson not installed — loading legacy array file whole")
+            yield from orjson.loads(f.read())
 
 
 def step7_final_assembly():
@@ -562,11 +1136,8 @@ def step7_final_assembly():
     print("Step 7: Final Schema Assembly")
     print("=" * 60)
 
-    with open(ENRICHED_JSON, "r", encoding="utf-8") as f:
-        scholars = json.load(f)
-
     final = []
-    for scholar in scholars:
+    for scholar in _iter_enriched(ENRICHED_JSON):
         doc = {
             # Core identity
             "id": scholar.get("discoveryUrlId", ""),
@@ -590,11 +1161,12 @@ def step7_final_assembly():
         }
         final.append(doc)
 
-    # Sort by relevance descending
-    final.sort(key=lambda x: x["relevance_score"], reverse=True)
+    # Sort by relevance descending — itemgetter runs at C level, no
+    # per-comparison lambda dispatch
+    final.sort(key=itemgetter("relevance_score"), reverse=True)
 
-    with open(FINAL_JSON, "w", encoding="utf-8") as f:
-        json.dump(final, f, indent=2, ensure_ascii=False)
+    with open(FINAL_JSON, "wb") as f:
+        f.write(orjson.dumps(final, option=orjson.OPT_INDENT_2))
 
     # Validation
     missing_id = sum(1 for s in final if not s["id"])
@@ -631,35 +1203,48 @@ def step8_upload():
     print("Step 8: Upload to MongoDB + Static Fallback")
     print("=" * 60)
 
-    with open(FINAL_JSON, "r", encoding="utf-8") as f:
-        scholars = json.load(f)
+    with open(FINAL_JSON, "rb") as f:
+        scholars = orjson.loads(f.read())
 
     # ── MongoDB upload ──
     mongodb_uri = os.environ.get("MONGODB_URI", "")
     if mongodb_uri:
         try:
-            from pymongo import MongoClient
+            from pymongo import IndexModel, MongoClient, ReplaceOne
 
             print("Connecting to MongoDB...")
-            client = MongoClient(mongodb_uri)
+            client = MongoClient(mongodb_uri, w=1, compressors="zstd")
             db = client[MONGODB_DB]
             collection = db[MONGODB_COLLECTION]
 
             existing = collection.count_documents({})
             print(f"  Existing documents: {existing}")
 
-            collection.delete_many({})
-            print(f"  Cleared collection")
-
-            result = collection.insert_many(scholars)
-            print(f"  Inserted {len(result.inserted_ids)} documents")
+            # Idempotent upsert — readers never see an empty collection, and
+            # ordered=False lets the server apply the batch in parallel
+            ops = [
+                ReplaceOne({"id": s["id"]}, s, upsert=True) for s in scholars
+            ]
+            result = collection.bulk_write(ops, ordered=False)
+            print(
+                f"  Upserted {result.upserted_count}, "
+                f"modified {result.modified_count} documents"
+            )
 
-            # Create indexes
-            collection.create_index("id", unique=True)
-            collection.create_index("relevance_score")
-            collection.create_index("department")
-            collection.create_index("position")
-            collection.create_index("active_grants_count")
+            # Prune scholars that dropped out of the source data
+            current_ids = [s["id"] for s in scholars]
+            removed = collection.delete_many({"id": {"$nin": current_ids}})
+            if removed.deleted_count:
+                print(f"  Removed {removed.deleted_count} stale documents")
+
+            # Create indexes in a single round-trip (no-op if already present)
+            collection.create_indexes([
+                IndexModel("id", unique=True),
+                IndexModel("relevance_score"),
+                IndexModel("department"),
+                IndexModel("position"),
+                IndexModel("active_grants_count"),
+            ])
             print(
                 f"  Indexes: id, relevance_score, department, position, active_grants_count"
             )
@@ -677,10 +1262,17 @@ def step8_upload():
         print("  Set it via: export MONGODB_URI='mongodb+srv://...'")
 
     # ── Static fallback ──
+    # Compact JSON (no indent) plus a gzipped sibling the server can ship
+    # directly; the indented FINAL_JSON stays around as the dev artifact
     dest = os.path.join(PROJECT_ROOT, "src", "data.json")
-    shutil.copy2(FINAL_JSON, dest)
+    blob = orjson.dumps(scholars)
+    with open(dest, "wb") as f:
+        f.write(blob)
+    with gzip.open(dest + ".gz", "wb", compresslevel=6) as f:
+        f.write(blob)
     size_mb = os.path.getsize(dest) / (1024 * 1024)
-    print(f"\n✓ Static fallback: {dest} ({size_mb:.1f} MB)")
+    gz_mb = os.path.getsize(dest + ".gz") / (1024 * 1024)
+    print(f"\n✓ Static fallback: {dest} ({size_mb:.1f} MB, {gz_mb:.1f} MB gzipped)")
 
     print(f"\n{'=' * 60}")
     print(f"🎉 Pipeline complete!")